@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🖼️ Thumbnail Cache v1.0 - Скачивает превью один раз и хранит уменьшенные копии в репозитории
+"""
+
+import glob
+import hashlib
+import io
+import json
+import os
+from datetime import datetime, timedelta
+from urllib.request import urlopen
+
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_FILE = os.path.join(PROJECT_ROOT, "api-cache", "thumbnails.json")
+
+# Файлы кэша парсеров и ключ со списком материалов в каждом
+CACHE_FILES = [
+    ("youtube-videos.json", "videos"),
+    ("habr-articles.json", "articles"),
+    ("forums-rss.json", "posts"),
+    ("forums-html.json", "posts"),
+]
+
+# Размеры карточки (.article-card img: 180px по высоте) — 1x и 2x
+CARD_SIZES = [(320, 180), (640, 360)]
+
+# Не пытаемся снова скачать недоступную картинку (404, приватное видео) раньше этого срока
+RETRY_FAILED_AFTER = timedelta(hours=24)
+
+def load_json_file(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except:
+        return None
+
+def variant_path(digest, size):
+    """Относительный путь варианта: thumbnails/ab/abcdef...-320x180.jpg"""
+    width, height = size
+    return f"thumbnails/{digest[:2]}/{digest}-{width}x{height}.jpg"
+
+def has_variants(digest):
+    return all(
+        os.path.exists(os.path.join(PROJECT_ROOT, variant_path(digest, size)))
+        for size in CARD_SIZES
+    )
+
+def build_srcset(digest):
+    return ", ".join(
+        f"{variant_path(digest, size)} {size[0]}w" for size in CARD_SIZES
+    )
+
+def download_image(url):
+    response = urlopen(url, timeout=10)
+    return response.read()
+
+def save_variants(digest, data):
+    image = Image.open(io.BytesIO(data))
+    image = image.convert("RGB")
+
+    for size in CARD_SIZES:
+        output_file = os.path.join(PROJECT_ROOT, variant_path(digest, size))
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+        # ImageOps.fit обрезает под 16:9 — заодно убирает чёрные полосы hqdefault
+        variant = ImageOps.fit(image, size, Image.LANCZOS)
+        variant.save(output_file, "JPEG", quality=80, optimize=True, progressive=True)
+
+def cache_image(url, manifest):
+    """Возвращает хэш содержимого для url, скачивая картинку только при необходимости"""
+    digest = manifest.get(url)
+    if digest and has_variants(digest):
+        return digest, False
+
+    data = download_image(url)
+    digest = hashlib.sha256(data).hexdigest()
+
+    if not has_variants(digest):
+        save_variants(digest, data)
+
+    manifest[url] = digest
+    return digest, True
+
+def is_failed_recently(url, failed):
+    try:
+        failed_at = datetime.fromisoformat(failed[url])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return datetime.now() - failed_at < RETRY_FAILED_AFTER
+
+def cache_items(items, manifest, failed=None):
+    """Переписывает image на локальные варианты; failed — url недоступных картинок с временем ошибки"""
+    if failed is None:
+        failed = {}
+
+    downloaded = 0
+    cached = 0
+
+    for item in items:
+        url = item.get("image")
+        if not url or not url.startswith(("http://", "https://")):
+            continue
+
+        if is_failed_recently(url, failed):
+            continue
+
+        try:
+            digest, fetched = cache_image(url, manifest)
+        except Exception as e:
+            print(f"   ⚠️  Не удалось загрузить {url}: {e}")
+            failed[url] = datetime.now().isoformat()
+            continue
+
+        failed.pop(url, None)
+
+        item["imageOriginal"] = url
+        item["image"] = variant_path(digest, CARD_SIZES[0])
+        item["imageSrcset"] = build_srcset(digest)
+
+        if fetched:
+            downloaded += 1
+        else:
+            cached += 1
+
+    return downloaded, cached
+
+def collect_urls(items):
+    """Исходные url картинок, на которые ссылаются материалы (до и после перезаписи)"""
+    urls = set()
+    for item in items:
+        url = item.get("imageOriginal") or item.get("image")
+        if url and url.startswith(("http://", "https://")):
+            urls.add(url)
+    return urls
+
+def prune_unreferenced(manifest, referenced):
+    """Удаляет из манифеста и с диска превью, на которые больше никто не ссылается"""
+    for url in [u for u, digest in manifest.items() if digest not in referenced]:
+        del manifest[url]
+
+    removed = 0
+    pattern = os.path.join(PROJECT_ROOT, "thumbnails", "*", "*.jpg")
+    for filepath in glob.glob(pattern):
+        digest = os.path.basename(filepath).split("-")[0]
+        if digest not in referenced:
+            os.remove(filepath)
+            removed += 1
+
+    return removed
+
+def main():
+    print("🖼️ Thumbnail Cache v1.0\n")
+
+    if not HAS_PIL:
+        print("⚠️  Pillow не установлен — превью остаются внешними ссылками")
+        return True
+
+    manifest_data = load_json_file(MANIFEST_FILE) or {}
+    manifest = dict(manifest_data.get("images", {}))
+    failed = dict(manifest_data.get("failed", {}))
+    current_urls = set()
+
+    for filename, key in CACHE_FILES:
+        cache_file = os.path.join(PROJECT_ROOT, "api-cache", filename)
+        data = load_json_file(cache_file)
+        if not data or not data.get(key):
+            continue
+
+        downloaded, cached = cache_items(data[key], manifest, failed)
+        current_urls |= collect_urls(data[key])
+        if not downloaded and not cached:
+            continue
+
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        print(f"   ✅ {filename}: {downloaded} загружено, {cached} из кэша")
+
+    referenced = {manifest[url] for url in current_urls if url in manifest}
+    removed = prune_unreferenced(manifest, referenced)
+    failed = {url: failed_at for url, failed_at in failed.items() if url in current_urls}
+
+    if removed:
+        print(f"   🗑️  Удалено устаревших превью: {removed}")
+
+    if manifest == manifest_data.get("images") and failed == manifest_data.get("failed", {}):
+        print(f"\n✅ В кэше: {len(manifest)} превью (без изменений)")
+        return True
+
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            "images": manifest,
+            "failed": failed,
+            "count": len(manifest),
+            "lastUpdated": datetime.now().isoformat()
+        }, f, ensure_ascii=False, indent=2)
+
+    print(f"\n✅ В кэше: {len(manifest)} превью")
+    return True
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if main() else 1)
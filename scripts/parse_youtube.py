@@ -30,6 +30,9 @@ YOUTUBE_CHANNELS = [
     ("В гараже у Сандро", "UCqJqV8e8t7wz_xK9y6Vq_5g"),
 ]
 
+# Можно подменить локальным HTTP-сервером (например, в тестах cache_thumbnails.py)
+THUMBNAIL_HOST = os.environ.get("YOUTUBE_THUMBNAIL_HOST", "https://img.youtube.com")
+
 def get_video_id(link):
     try:
         if "youtube.com" in link:
@@ -49,7 +52,7 @@ def parse_youtube_search(query):
         for entry in feed.entries[:10]:
             try:
                 video_id = get_video_id(entry.link)
-                thumbnail = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg" if video_id else None
+                thumbnail = f"{THUMBNAIL_HOST}/vi/{video_id}/hqdefault.jpg" if video_id else None
                 
                 video = {
                     "id": f"yt_{video_id}",
@@ -82,7 +85,7 @@ def parse_youtube_channel(channel_name, channel_id):
         for entry in feed.entries[:5]:
             try:
                 video_id = get_video_id(entry.link)
-                thumbnail = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg" if video_id else None
+                thumbnail = f"{THUMBNAIL_HOST}/vi/{video_id}/hqdefault.jpg" if video_id else None
                 
                 video = {
                     "id": f"yt_{video_id}",
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""
+Тесты кэша превью: локальный http.server вместо img.youtube.com
+"""
+
+import hashlib
+import importlib
+import os
+import threading
+from datetime import datetime, timedelta
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image
+
+from scripts import cache_thumbnails
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        CountingHandler.requests.append(self.path)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def youtube_stub(tmp_path):
+    """Отдаёт vi/abc/hqdefault.jpg (480×360) так же, как img.youtube.com"""
+    serve_dir = tmp_path / "serve"
+    (serve_dir / "vi" / "abc").mkdir(parents=True)
+    jpeg = serve_dir / "vi" / "abc" / "hqdefault.jpg"
+    Image.new("RGB", (480, 360), "red").save(jpeg, "JPEG")
+
+    CountingHandler.requests = []
+    handler = partial(CountingHandler, directory=str(serve_dir))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    yield SimpleNamespace(
+        host=host,
+        digest=hashlib.sha256(jpeg.read_bytes()).hexdigest(),
+        requests=CountingHandler.requests,
+    )
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def project_root(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    (root / "api-cache").mkdir(parents=True)
+    monkeypatch.setattr(cache_thumbnails, "PROJECT_ROOT", str(root))
+    monkeypatch.setattr(cache_thumbnails, "MANIFEST_FILE", str(root / "api-cache" / "thumbnails.json"))
+    return root
+
+
+def test_downloads_once_and_rewrites_image(youtube_stub, project_root):
+    url = f"{youtube_stub.host}/vi/abc/hqdefault.jpg"
+    items = [{"id": "yt_abc", "image": url}]
+    manifest = {}
+
+    downloaded, cached = cache_thumbnails.cache_items(items, manifest)
+
+    digest = youtube_stub.digest
+    small = f"thumbnails/{digest[:2]}/{digest}-320x180.jpg"
+    large = f"thumbnails/{digest[:2]}/{digest}-640x360.jpg"
+    assert (downloaded, cached) == (1, 0)
+    assert Image.open(project_root / small).size == (320, 180)
+    assert Image.open(project_root / large).size == (640, 360)
+    assert items[0]["image"] == small
+    assert items[0]["imageSrcset"] == f"{small} 320w, {large} 640w"
+    assert items[0]["imageOriginal"] == url
+    assert manifest == {url: digest}
+
+    # Следующий запуск: парсер снова отдаёт внешнюю ссылку, но скачивать её не нужно
+    requests_before = len(youtube_stub.requests)
+    digest_again, fetched = cache_thumbnails.cache_image(url, manifest)
+    assert (digest_again, fetched) == (digest, False)
+
+    downloaded, cached = cache_thumbnails.cache_items([{"id": "yt_abc", "image": url}], manifest)
+    assert (downloaded, cached) == (0, 1)
+    assert len(youtube_stub.requests) == requests_before
+
+
+def test_missing_image_is_left_untouched_and_not_retried(youtube_stub, project_root):
+    url = f"{youtube_stub.host}/vi/missing/hqdefault.jpg"
+    items = [{"id": "yt_missing", "image": url}]
+    manifest = {}
+    failed = {}
+
+    assert cache_thumbnails.cache_items(items, manifest, failed) == (0, 0)
+    assert items[0] == {"id": "yt_missing", "image": url}
+    assert manifest == {}
+    assert url in failed
+    assert len(youtube_stub.requests) == 1
+
+    cache_thumbnails.cache_items(items, manifest, failed)
+    assert len(youtube_stub.requests) == 1
+
+    failed[url] = (datetime.now() - timedelta(days=2)).isoformat()
+    cache_thumbnails.cache_items(items, manifest, failed)
+    assert len(youtube_stub.requests) == 2
+
+
+def test_prune_removes_thumbnails_of_dropped_videos(youtube_stub, project_root):
+    url = f"{youtube_stub.host}/vi/abc/hqdefault.jpg"
+    manifest = {}
+    cache_thumbnails.cache_items([{"id": "yt_abc", "image": url}], manifest)
+
+    stale = project_root / "thumbnails" / "ff" / ("ff" * 32 + "-320x180.jpg")
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"")
+    manifest["https://img.youtube.com/vi/gone/hqdefault.jpg"] = "ff" * 32
+
+    removed = cache_thumbnails.prune_unreferenced(manifest, {youtube_stub.digest})
+
+    assert removed == 1
+    assert not stale.exists()
+    assert manifest == {url: youtube_stub.digest}
+    assert cache_thumbnails.has_variants(youtube_stub.digest)
+
+
+def test_youtube_parser_uses_thumbnail_host(youtube_stub, project_root, monkeypatch):
+    feedparser = pytest.importorskip("feedparser")
+    monkeypatch.setenv("YOUTUBE_THUMBNAIL_HOST", youtube_stub.host)
+    from scripts import parse_youtube
+    parse_youtube = importlib.reload(parse_youtube)
+
+    entry = SimpleNamespace(
+        link="https://www.youtube.com/watch?v=abc",
+        title="Ремонт стартера",
+        summary="",
+        published="Wed, 26 Nov 2025 12:24:03 GMT",
+    )
+    monkeypatch.setattr(feedparser, "parse", lambda url: SimpleNamespace(entries=[entry]))
+
+    videos = parse_youtube.parse_youtube_search("ремонт стартера")
+
+    assert videos[0]["image"] == f"{youtube_stub.host}/vi/abc/hqdefault.jpg"
+    assert cache_thumbnails.cache_items(videos, {}) == (1, 0)
+    assert videos[0]["imageOriginal"].startswith(youtube_stub.host)
+
+    monkeypatch.delenv("YOUTUBE_THUMBNAIL_HOST")
+    importlib.reload(parse_youtube)
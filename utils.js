@@ -57,5 +57,16 @@ function formatDate(isoString) {
     return new Date(isoString).toLocaleDateString('ru-RU');
 }
 
+// Превью карточки: локальные варианты из thumbnails/ (см. scripts/cache_thumbnails.py)
+// sizes повторяет сетку .articles-grid в styles.css: 1 колонка, 2 с 640px, 3 с 1024px
+function renderCardImage(item) {
+    if (!item.image) return '';
+    const srcset = item.imageSrcset
+        ? ` srcset="${item.imageSrcset}" sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"`
+        : '';
+    return `<img src="${item.image}"${srcset} alt="" loading="lazy">`;
+}
+
 window.decodeVIN = decodeVIN;
 window.formatDate = formatDate;
+window.renderCardImage = renderCardImage;